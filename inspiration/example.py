@@ -1,23 +1,42 @@
 import clr
+import gc
 import sys
 import os
 
 # 添加 Avalonia DLL 所在目录到搜索路径
 avalonia_dir = r"D:\classisland\app-1.7.106.2-0"
-sys.path.append(avalonia_dir)
+sys.path.insert(0, avalonia_dir)
 
-# 加载必要的 Avalonia 程序集
-clr.AddReference("Avalonia.Base")
-clr.AddReference("Avalonia.Controls")
-clr.AddReference("Avalonia.Desktop")
-clr.AddReference("Avalonia.Markup.Xaml")  # XAML支持
+# 加载必要的 Avalonia 程序集（按完整路径加载，跳过程序集探测）
+for assembly_name in (
+    "Avalonia.Base",
+    "Avalonia.Controls",
+    "Avalonia.Desktop",
+    "Avalonia.Markup.Xaml",  # XAML支持
+):
+    clr.AddReference(os.path.join(avalonia_dir, assembly_name + ".dll"))
+
+# 导入 .NET 命名空间（模块级只导入作为基类的类型）
+from Avalonia import Application
+from Avalonia.Controls import Window
+
+# 控件类型延迟到首次构建窗口时再导入，见 _load_ui_types()
+TextBlock = Button = StackPanel = None
+HorizontalAlignment = VerticalAlignment = None
+_MARGIN_BOTTOM_20 = None
+
+
+def _load_ui_types():
+    global TextBlock, Button, StackPanel
+    global HorizontalAlignment, VerticalAlignment, _MARGIN_BOTTOM_20
+    if _MARGIN_BOTTOM_20 is not None:
+        return
+    from Avalonia import Thickness
+    from Avalonia.Controls import TextBlock, Button, StackPanel
+    from Avalonia.Layout import HorizontalAlignment, VerticalAlignment
+    # 常用的布局常量，只构造一次
+    _MARGIN_BOTTOM_20 = Thickness(0, 0, 0, 20)
 
-# 导入 .NET 命名空间
-from Avalonia import Application, AppBuilder
-from Avalonia.Controls import Window, TextBlock, Button, StackPanel
-from Avalonia.Interactivity import RoutedEventArgs
-from Avalonia.Layout import HorizontalAlignment, VerticalAlignment
-from System import EventArgs
 
 class MainWindow(Window):
     def __init__(self):
@@ -25,10 +44,12 @@ class MainWindow(Window):
         self.InitializeComponent()
     
     def InitializeComponent(self):
-        # 设置窗口属性
+        _load_ui_types()
+
+        # 设置窗口属性（尺寸类属性均为 double，直接传 float 免去 int 转换）
         self.Title = "Python + Avalonia 示例"
-        self.Width = 800
-        self.Height = 600
+        self.Width = 800.0
+        self.Height = 600.0
         
         # 创建控件
         stack_panel = StackPanel()
@@ -38,15 +59,15 @@ class MainWindow(Window):
         # 创建文本
         text_block = TextBlock()
         text_block.Text = "🎉 Hello, Avalonia from Python!"
-        text_block.FontSize = 24
-        text_block.Margin = clr.System.Windows.Thickness(0, 0, 0, 20)
+        text_block.FontSize = 24.0
+        text_block.Margin = _MARGIN_BOTTOM_20
         
         # 创建按钮
         button = Button()
         button.Content = "点击我"
-        button.FontSize = 18
-        button.Width = 200
-        button.Height = 50
+        button.FontSize = 18.0
+        button.Width = 200.0
+        button.Height = 50.0
         button.Click += self.OnButtonClick  # 绑定事件
         
         # 添加到布局
@@ -62,11 +83,19 @@ class MainWindow(Window):
             sender.Content = "已点击!"
 
 class App(Application):
+    _main_window = None
+
+    def get_main_window(self):
+        # 主窗口只构造并显示一次，两条启动路径共用
+        if self._main_window is None:
+            self._main_window = MainWindow()
+            self._main_window.Show()
+        return self._main_window
+
     def OnFrameworkInitializationCompleted(self):
         # 当框架初始化完成后创建主窗口
         if self.ApplicationLifetime is not None:
-            self.MainWindow = MainWindow()
-            self.MainWindow.Show()
+            self.MainWindow = self.get_main_window()
         super().OnFrameworkInitializationCompleted()
 
 def main():
@@ -79,9 +108,15 @@ def main():
         # 如果上面的方式不行，尝试以下替代方案：
         
         # 替代方案：直接创建窗口
-        app = App()
-        window = MainWindow()
-        window.Show()
+        # 构造期间会产生大量 CLR 包装对象，暂停 GC 以免中途反复扫描；
+        # 构造完成后冻结这些常驻对象，再恢复 GC 进入消息循环
+        gc.disable()
+        try:
+            app = App()
+            window = app.get_main_window()
+            gc.freeze()
+        finally:
+            gc.enable()
         
         # 启动消息循环
         app.Run(window)
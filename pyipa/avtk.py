@@ -1,14 +1,23 @@
 # ipaui.py - 重写后的 PowerPoint 控制与 avtk 交互示例
 # 依赖：pywin32, psutil, win32com, 以及你的 avtk 模块（AvTk 风格）
+import atexit
+import ctypes
+import functools
+import queue
 import time
 import threading
-from typing import Optional, Tuple
+import winreg
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from ctypes import wintypes
+from typing import Callable, Dict, Optional, Tuple
 
 import psutil
 import win32gui
 import win32process
 import win32con
 import win32api
+import win32event
 import pythoncom
 import win32com.client
 
@@ -18,11 +27,152 @@ from . import avtk
 # 全局缓存的 PowerPoint COM 对象（惰性初始化）
 _PPT_APP = None
 
+# SlideShowView.PointerType 取值（PpSlideShowPointerType），
+# 连接 PowerPoint 后由 _resolve_pointer_constants() 用类型库常量覆盖一次
+_POINTER_MAP: Dict[str, int] = {
+    "arrow": 1,   # ppSlideShowPointerArrow
+    "pen": 2,     # ppSlideShowPointerPen
+    "eraser": 5,  # ppSlideShowPointerEraser
+}
+
+# PowerPoint 顶层窗口类名：放映窗口 / 主窗口（PP12FrameClass 为部分版本使用的主窗口类名）
+_PPT_WINDOW_CLASSES = frozenset(("screenClass", "PPTFrameClass", "PP12FrameClass"))
+
+# SendKeys 回退使用的 WScript.Shell，在 COM 工作线程上首次使用时创建一次
+_SHELL = None
+
+
+# ------- PowerPoint COM 工作线程 -------
+# 所有 PowerPoint COM 调用都在同一个线程（独立的 STA + 消息泵）上执行，
+# UI 回调只投递任务，PowerPoint 卡顿时界面不会被阻塞。
+# 下面的各类缓存（_PPT_APP、放映状态、View）也只在该线程上读写。
+_ppt_queue: "queue.Queue[Tuple[Future, Callable, tuple]]" = queue.Queue()
+_ppt_wakeup = win32event.CreateEvent(None, False, False, None)
+
+
+def _ppt_loop():
+    pythoncom.CoInitialize()
+    while True:
+        rc = win32event.MsgWaitForMultipleObjects(
+            [_ppt_wakeup], False, win32event.INFINITE, win32event.QS_ALLINPUT
+        )
+        if rc == win32event.WAIT_OBJECT_0 + 1:
+            # 有窗口消息到达，交给 COM 处理
+            pythoncom.PumpWaitingMessages()
+            continue
+        while True:
+            try:
+                future, fn, args = _ppt_queue.get_nowait()
+            except queue.Empty:
+                break
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args))
+            except Exception as e:
+                future.set_exception(e)
+
+
+_ppt_worker = threading.Thread(target=_ppt_loop, name="ppt-com", daemon=True)
+_ppt_worker.start()
+
+
+def _ppt_call(fn: Callable, *args) -> Future:
+    """在 COM 工作线程上执行 fn(*args)，返回 Future（已在工作线程上时直接执行）"""
+    future = Future()
+    if threading.current_thread() is _ppt_worker:
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+    _ppt_queue.put((future, fn, args))
+    win32event.SetEvent(_ppt_wakeup)
+    return future
+
+
+def _report_ppt_error(future: Future):
+    e = future.exception()
+    if e is not None:
+        print("PowerPoint 操作失败:", e)
+
+
+def _ppt_post(fn: Callable, *args):
+    """投递不需要结果的操作；失败时打印错误，不抛给调用方"""
+    _ppt_call(fn, *args).add_done_callback(_report_ppt_error)
+
+
+# 同步等待工作线程结果的上限（秒）：COM 调用卡住时不要把调用方（界面线程）一起拖住
+_PPT_CALL_TIMEOUT = 2.0
+
+
+def _ppt_timeout() -> Optional[float]:
+    # 首次连接可能要生成类型库包装（makepy）甚至冷启动 PowerPoint，连上之前不设超时
+    return _PPT_CALL_TIMEOUT if _PPT_APP is not None else None
+
+
+def _ppt_wait(future: Future, default):
+    """等待 _ppt_call 返回的 Future；超时打印提示并返回 default，其他异常照常抛出"""
+    try:
+        return future.result(timeout=_ppt_timeout())
+    except FutureTimeoutError:
+        print("PowerPoint 响应超时")
+        return default
+
+
+# pid -> 进程句柄的小型 LRU 缓存（模块私有）；持有句柄期间该 pid 不会被系统复用。
+# 对外只返回 DuplicateHandle 复制出来的句柄，缓存中的句柄只由本模块关闭。
+_PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+_PROC_HANDLE_CACHE_SIZE = 8
+_proc_handle_cache: "OrderedDict[int, object]" = OrderedDict()
+_proc_handle_lock = threading.Lock()
+
+
+def _duplicate_process_handle(pid: int):
+    """返回 pid 对应进程句柄的一个副本（由调用方持有）；原句柄留在缓存中"""
+    with _proc_handle_lock:
+        handle = _proc_handle_cache.get(pid)
+        if handle is not None:
+            _proc_handle_cache.move_to_end(pid)
+        else:
+            handle = win32api.OpenProcess(_PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+            _proc_handle_cache[pid] = handle
+            if len(_proc_handle_cache) > _PROC_HANDLE_CACHE_SIZE:
+                _, oldest = _proc_handle_cache.popitem(last=False)
+                oldest.Close()
+        # 在锁内复制，避免复制前缓存中的句柄被淘汰关闭
+        current = win32api.GetCurrentProcess()
+        return win32api.DuplicateHandle(
+            current, handle, current, 0, False, win32con.DUPLICATE_SAME_ACCESS
+        )
+
+
+@atexit.register
+def _close_process_handles():
+    with _proc_handle_lock:
+        while _proc_handle_cache:
+            _, handle = _proc_handle_cache.popitem()
+            handle.Close()
+
+
+def get_foreground_window_process_handle() -> Optional[object]:
+    """
+    返回前台窗口所属进程的句柄（PROCESS_QUERY_LIMITED_INFORMATION），失败返回 None。
+    调用方负责关闭返回的句柄（它是缓存句柄的副本，关闭它不影响缓存）。
+    """
+    try:
+        hwnd = win32gui.GetForegroundWindow()
+        _, pid = win32process.GetWindowThreadProcessId(hwnd)
+        return _duplicate_process_handle(pid)
+    except Exception:
+        return None
+
 
 def get_foreground_process_info() -> Optional[Tuple[int, str, int]]:
     """
     返回 (pid, process_name, hwnd) 或 None（如果无法获取）
     使用 win32gui + win32process + psutil 以获得可靠的进程名。
+    （PowerPoint 检测只看窗口类名，不走这里，所以进程名不做缓存。）
     """
     try:
         hwnd = win32gui.GetForegroundWindow()
@@ -39,28 +189,61 @@ def get_foreground_process_info() -> Optional[Tuple[int, str, int]]:
         return None
 
 
+def _foreground_hwnd_if_powerpoint() -> Optional[int]:
+    """
+    前台窗口属于 PowerPoint 时返回其句柄，否则返回 None。
+    只比较窗口类名（一次系统调用），不查询进程。
+    """
+    hwnd = win32gui.GetForegroundWindow()
+    if not hwnd:
+        return None
+    try:
+        if win32gui.GetClassName(hwnd) in _PPT_WINDOW_CLASSES:
+            return hwnd
+    except Exception:
+        pass
+    return None
+
+
 def is_foreground_powerpoint() -> bool:
-    info = get_foreground_process_info()
-    if not info:
+    # 只看前台窗口的类名，不再经 get_foreground_process_info 查询进程名
+    hwnd = win32gui.GetForegroundWindow()
+    if not hwnd:
         return False
-    _, name, _ = info
-    if not name:
+    try:
+        return win32gui.GetClassName(hwnd) in _PPT_WINDOW_CLASSES
+    except Exception:
+        # 窗口在两次调用之间被销毁
         return False
-    return name.lower() in ("powerpnt.exe", "powerpoint.exe")
 
 
-def get_powerpoint_app() -> Optional[object]:
+def _resolve_pointer_constants():
+    """用 EnsureDispatch 生成的类型库常量填充 _POINTER_MAP（只在连接时执行一次）"""
+    c = win32com.client.constants
+    try:
+        _POINTER_MAP.update(
+            arrow=c.ppSlideShowPointerArrow,
+            pen=c.ppSlideShowPointerPen,
+            eraser=c.ppSlideShowPointerEraser,
+        )
+    except AttributeError:
+        # 类型库未生成常量时保留默认值
+        pass
+
+
+def _get_app() -> Optional[object]:
     """
-    惰性获取 PowerPoint.Application COM 对象并缓存。
-    注意：调用 COM 接口前应在当前线程调用 pythoncom.CoInitialize()（如果在新线程使用）。
+    惰性获取 PowerPoint.Application COM 对象并缓存（只在 COM 工作线程上调用）。
+    返回的对象属于工作线程，不能交给其他线程使用。
     """
     global _PPT_APP
     if _PPT_APP is not None:
         return _PPT_APP
     try:
-        # 确保 COM 已初始化（如果此函数在非主线程调用）
-        pythoncom.CoInitialize()
-        _PPT_APP = win32com.client.Dispatch("PowerPoint.Application")
+        # 早绑定：生成并缓存类型库包装，属性/方法调用使用预解析的 DISPID，
+        # 而不是每次都经 GetIDsOfNames + Invoke
+        _PPT_APP = win32com.client.gencache.EnsureDispatch("PowerPoint.Application")
+        _resolve_pointer_constants()
         return _PPT_APP
     except Exception as e:
         # 无 PowerPoint 或 COM 调用失败
@@ -68,12 +251,12 @@ def get_powerpoint_app() -> Optional[object]:
         return None
 
 
-def ensure_powerpoint_in_slideshow() -> object:
+def _ensure_in_slideshow() -> object:
     """
-    获取 PowerPoint 应用对象并确保当前有处于放映状态的窗口。
+    获取 PowerPoint 应用对象并确保当前有处于放映状态的窗口（只在 COM 工作线程上调用）。
     返回 PPT 应用对象（成功），否则抛出异常。
     """
-    ppt = get_powerpoint_app()
+    ppt = _get_app()
     if ppt is None:
         raise RuntimeError("未找到 PowerPoint 应用.")
     try:
@@ -82,21 +265,77 @@ def ensure_powerpoint_in_slideshow() -> object:
             raise RuntimeError("当前没有处于放映状态的幻灯片放映窗口.")
         return ppt
     except Exception as e:
+        # 放映已结束或 COM 调用失败，缓存的 View 不再可用
+        _invalidate_view_cache()
         raise RuntimeError(f"检查放映状态失败: {e}")
 
 
-def checkIfPPTLockedOrReadOnly() -> bool:
+def get_powerpoint_app() -> Optional[object]:
+    """
+    返回调用线程自己的 PowerPoint.Application 对象（每次新建 Dispatch），无法连接时返回 None。
+    本模块缓存的早绑定对象属于 COM 工作线程，不会交给调用方。
+    """
+    if _ppt_wait(_ppt_call(_get_app), None) is None:
+        return None
+    # 调用线程可能还没有初始化 COM
+    pythoncom.CoInitialize()
+    return win32com.client.Dispatch("PowerPoint.Application")
+
+
+def ensure_powerpoint_in_slideshow():
+    """
+    确保已连接 PowerPoint 且当前有处于放映状态的窗口，否则抛出异常。
+    检查在 COM 工作线程上进行，不返回 PowerPoint 对象（需要时用 get_powerpoint_app）。
+    """
+    _ppt_call(_ensure_in_slideshow).result(timeout=_ppt_timeout())
+
+
+# 放映状态检查结果的缓存时长（秒）：连续按键时不必每次都经 COM 重新检查
+_PPT_STATE_TTL = 0.25
+_ppt_state_cache = {"ts": 0.0, "ppt": None}
+
+
+def _cached_ensure_ppt(ttl: float = _PPT_STATE_TTL) -> object:
+    """
+    带短时缓存的 _ensure_in_slideshow()。
+    ttl 秒内复用上一次成功的结果；失败时照常抛出异常且不缓存。
+    """
+    now = time.monotonic()
+    if _ppt_state_cache["ppt"] is not None and now - _ppt_state_cache["ts"] < ttl:
+        return _ppt_state_cache["ppt"]
+    _ppt_state_cache["ppt"] = None
+    ppt = _ensure_in_slideshow()
+    _ppt_state_cache["ts"] = now
+    _ppt_state_cache["ppt"] = ppt
+    return ppt
+
+
+def _invalidate_ppt_state():
+    _ppt_state_cache["ppt"] = None
+
+
+def checkIfPPTLockedOrReadOnly() -> Optional[bool]:
     """
     检查当前 ActivePresentation 是否只读（或无法访问）。
-    返回 True 表示被锁定/只读/不可访问。
+    返回 True 表示被锁定/只读/不可访问；PowerPoint 未及时响应时返回 None（状态未知）。
+    """
+    return _ppt_wait(_ppt_call(_is_locked_or_readonly), None)
+
+
+def _is_readonly(pres) -> bool:
+    """
+    读取 Presentation.ReadOnly（msoTriState，非 0 即只读）。
+    早绑定后这是类型库中的普通属性；COM 错误由调用方统一处理。
     """
-    ppt = get_powerpoint_app()
+    return bool(pres.ReadOnly)
+
+
+def _is_locked_or_readonly() -> bool:
+    ppt = _get_app()
     if not ppt:
         return True
     try:
-        pres = ppt.ActivePresentation
-        # Presentation 对象通常有 ReadOnly 属性（如果不存在，可根据需要调整）
-        return bool(getattr(pres, "ReadOnly", False))
+        return _is_readonly(ppt.ActivePresentation)
     except Exception:
         # 无法获取 Presentation（可能没有打开演示文稿）
         return True
@@ -107,13 +346,16 @@ def Unlock():
     尝试解除只读（注：许多只读/保护视图问题无法通过 COM 在外部强制解除）。
     这里我们尽量尝试一些安全操作，否则提示用户手动解除。
     """
-    ppt = get_powerpoint_app()
+    return _ppt_wait(_ppt_call(_unlock), False)
+
+
+def _unlock():
+    ppt = _get_app()
     if not ppt:
         print("未连接 PowerPoint，无法解除锁定。")
         return False
     try:
-        pres = ppt.ActivePresentation
-        if getattr(pres, "ReadOnly", False):
+        if _is_readonly(ppt.ActivePresentation):
             # 尝试保存为新的文件（提示用户选择路径）或提示用户手动解除保护
             print("当前演示文稿为只读。建议另存为或在 PowerPoint 中手动解除保护。")
             return False
@@ -124,122 +366,319 @@ def Unlock():
         return False
 
 
+# PowerPoint 保护视图设置所在的注册表键（Office 16.0）
+_PROTECTED_VIEW_KEY = r"Software\Microsoft\Office\16.0\PowerPoint\Security"
+
+
+def DisableProtectedView() -> bool:
+    """
+    在注册表中关闭 PowerPoint 的保护视图（EnableProtectedView = 0）。
+    只影响之后打开的演示文稿；成功返回 True。
+    """
+    try:
+        with winreg.OpenKey(winreg.HKEY_CURRENT_USER, _PROTECTED_VIEW_KEY, 0, winreg.KEY_SET_VALUE) as key:
+            winreg.SetValueEx(key, "EnableProtectedView", 0, winreg.REG_DWORD, 0)
+        return True
+    except Exception as e:
+        print("无法关闭保护视图:", e)
+        return False
+
+
 # 控制放映的辅助函数（优先使用 PowerPoint COM API而不是 SendKeys）
+# 同一次放映内 SlideShowView 不变，缓存下来避免每次都经 COM 重新获取
+_view_cache = {"view": None, "hwnd": None, "ppt": None, "slide_count": None}
+
+# 本地跟踪的当前幻灯片索引：翻页时自行增减，避免每次都经 COM 读取；
+# None 表示未知，下次读取时从 COM 重新同步（放映开始/结束、跳转幻灯片后）
+_local_slide_idx: Optional[int] = None
+_local_slide_synced_at = 0.0
+# 本地索引至少每隔这么久（秒）从 COM 重新同步一次：在 PowerPoint 里直接翻页、
+# 或 Next() 只推进了动画时，本地索引最多偏差这么久
+_SLIDE_INDEX_RESYNC_INTERVAL = 2.0
+
+
+def _invalidate_view_cache():
+    global _local_slide_idx
+    _view_cache["view"] = None
+    _view_cache["hwnd"] = None
+    _view_cache["ppt"] = None
+    _view_cache["slide_count"] = None
+    # 放映窗口变了，本地记录的索引也要重新同步
+    _local_slide_idx = None
+
+
 def _get_slideshow_view(ppt):
-    """返回第一个放映窗口的 SlideShowView"""
+    """返回第一个放映窗口的 SlideShowView（按 ppt 对象缓存）"""
+    if _view_cache["view"] is not None and _view_cache["ppt"] is ppt:
+        return _view_cache["view"]
     try:
         # SlideShowWindows 是 1 基的集合对象（COM 接口）
         if ppt.SlideShowWindows.Count >= 1:
             ssw = ppt.SlideShowWindows(1)
-            return ssw.View
+            # 幻灯片总数用于限制本地索引的上界
+            _view_cache["slide_count"] = int(ssw.Presentation.Slides.Count)
+            _view_cache["view"] = ssw.View
+            _view_cache["ppt"] = ppt
+            return _view_cache["view"]
     except Exception:
         pass
     return None
 
 
-def SendPageDownToPPT():
-    ppt = ensure_powerpoint_in_slideshow()
+def _get_slideshow_hwnd(ppt) -> Optional[int]:
+    """返回第一个放映窗口的 HWND（与 View 共用缓存）"""
+    if _view_cache["hwnd"] is not None and _view_cache["ppt"] is ppt:
+        return _view_cache["hwnd"]
+    try:
+        if ppt.SlideShowWindows.Count >= 1:
+            _view_cache["hwnd"] = int(ppt.SlideShowWindows(1).HWND)
+            _view_cache["ppt"] = ppt
+            return _view_cache["hwnd"]
+    except Exception:
+        pass
+    return None
+
+
+def _step_local_slide_index(delta: int):
+    global _local_slide_idx
+    if _local_slide_idx is not None:
+        idx = max(1, _local_slide_idx + delta)
+        count = _view_cache["slide_count"]
+        if count is not None:
+            idx = min(idx, count)
+        _local_slide_idx = idx
+
+
+def _page_down():
+    ppt = _cached_ensure_ppt()
     view = _get_slideshow_view(ppt)
     if view is not None:
         try:
             view.Next()  # 使用 COM 的 Next 方法
         except Exception:
+            _invalidate_view_cache()
             # 回退到 SendKeys（不优先）
-            SendKeysToPPT("{PGDN}")
+            _send_keys("{PGDN}")
+        _step_local_slide_index(1)
 
 
-def SendPageUpToPPT():
-    ppt = ensure_powerpoint_in_slideshow()
+def _page_up():
+    ppt = _cached_ensure_ppt()
     view = _get_slideshow_view(ppt)
     if view is not None:
         try:
             view.Previous()
         except Exception:
-            SendKeysToPPT("{PGUP}")
+            _invalidate_view_cache()
+            _send_keys("{PGUP}")
+        _step_local_slide_index(-1)
 
 
-def SendEscToPPT():
-    ppt = ensure_powerpoint_in_slideshow()
+def _exit_slideshow():
+    ppt = _cached_ensure_ppt()
     view = _get_slideshow_view(ppt)
     if view is not None:
         try:
             view.Exit()
         except Exception:
-            SendKeysToPPT("{ESC}")
+            _send_keys("{ESC}")
+        # 放映已结束，下次操作需重新检查
+        _invalidate_ppt_state()
+        _invalidate_view_cache()
+
+
+# 直接通过 ctypes 调用 user32.EnumWindows：回调找到第一个匹配窗口后返回 FALSE 立即停止枚举
+# （win32gui.EnumWindows 在回调返回 FALSE 时会抛异常，只能枚举完所有窗口）。
+# 类名缓冲区和结果在模块级预分配，只在 COM 工作线程上使用。
+_user32 = ctypes.WinDLL("user32")
+_EnumWindowsProc = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+_user32.EnumWindows.argtypes = [_EnumWindowsProc, wintypes.LPARAM]
+_user32.EnumWindows.restype = wintypes.BOOL
+_user32.GetClassNameW.argtypes = [wintypes.HWND, wintypes.LPWSTR, ctypes.c_int]
+_user32.GetClassNameW.restype = ctypes.c_int
+_user32.IsWindowVisible.argtypes = [wintypes.HWND]
+_user32.IsWindowVisible.restype = wintypes.BOOL
+
+_CLASS_NAME_CHARS = 256
+_class_name_buf = ctypes.create_unicode_buffer(_CLASS_NAME_CHARS)
+_found_ppt_hwnd = wintypes.HWND()
+
+
+@_EnumWindowsProc
+def _enum_ppt_window(hwnd, lparam):
+    if (_user32.GetClassNameW(hwnd, _class_name_buf, _CLASS_NAME_CHARS)
+            and _class_name_buf.value in _PPT_WINDOW_CLASSES
+            and _user32.IsWindowVisible(hwnd)):
+        _found_ppt_hwnd.value = hwnd
+        return False
+    return True
 
 
-def SendKeysToPPT(keys: str):
+def _find_ppt_hwnd() -> Optional[int]:
+    """
+    枚举顶层窗口，按窗口类名返回第一个可见的 PowerPoint 窗口句柄。
+    只比较类名，不需要查询任何进程信息。
+    """
+    _found_ppt_hwnd.value = None
+    _user32.EnumWindows(_enum_ppt_window, 0)
+    return _found_ppt_hwnd.value
+
+
+# 可以直接投递给放映窗口的按键（SendKeys 写法 -> 虚拟键码）
+_VK_KEYS = {
+    "{PGDN}": win32con.VK_NEXT,
+    "{PGUP}": win32con.VK_PRIOR,
+    "{ESC}": win32con.VK_ESCAPE,
+}
+
+
+def _post_key_to_slideshow(vk: int) -> bool:
+    """用 PostMessage 把按键直接发给放映窗口，不要求其处于前台。成功返回 True。"""
+    ppt = _get_app()
+    if ppt is None:
+        return False
+    hwnd = _get_slideshow_hwnd(ppt)
+    if not hwnd:
+        return False
+    try:
+        win32api.PostMessage(hwnd, win32con.WM_KEYDOWN, vk, 0x00000001)
+        win32api.PostMessage(hwnd, win32con.WM_KEYUP, vk, 0xC0000001)
+        return True
+    except Exception:
+        _invalidate_view_cache()
+        return False
+
+
+def _send_keys(keys: str):
+    """
+    作为最后手段发送按键。
+    {PGDN}/{PGUP}/{ESC} 直接投递到放映窗口；其余按键用 SendKeys，要求 PowerPoint 窗口为前台。
     """
-    作为最后手段用 SendKeys。要求 PowerPoint 窗口为前台。
-    """
-    info = get_foreground_process_info()
-    if not info or info[1] is None or info[1].lower() not in ("powerpnt.exe", "powerpoint.exe"):
-        # 尝试激活 PowerPoint 主窗口（取第一个 PowerPoint 进程）
-        for p in psutil.process_iter(['name', 'pid']):
-            if p.info['name'] and p.info['name'].lower() in ("powerpnt.exe", "powerpoint.exe"):
-                try:
-                    # 找到进程对应的主窗口（非常简化的方式）
-                    hwnds = []
-                    def enum_cb(hwnd, extra):
-                        _, pid = win32process.GetWindowThreadProcessId(hwnd)
-                        if pid == p.info['pid'] and win32gui.IsWindowVisible(hwnd):
-                            hwnds.append(hwnd)
-                    win32gui.EnumWindows(enum_cb, None)
-                    if hwnds:
-                        win32gui.SetForegroundWindow(hwnds[0])
-                        break
-                except Exception:
-                    pass
+    global _SHELL
+    vk = _VK_KEYS.get(keys)
+    if vk is not None and _post_key_to_slideshow(vk):
+        return
+    if _foreground_hwnd_if_powerpoint() is None:
+        # 尝试激活 PowerPoint 窗口（按窗口类名查找）
+        try:
+            hwnd = _find_ppt_hwnd()
+            if hwnd:
+                win32gui.SetForegroundWindow(hwnd)
+        except Exception:
+            pass
     try:
-        shell = win32com.client.Dispatch("WScript.Shell")
-        shell.SendKeys(keys)
+        if _SHELL is None:
+            _SHELL = win32com.client.Dispatch("WScript.Shell")
+        _SHELL.SendKeys(keys)
     except Exception as e:
         print("SendKeys 失败:", e)
 
 
-def ToogleArrowStatusToPPT(status: str):
-    """
-    status: "arrow" / "pen" / "eraser"
-    使用 PowerPoint 常量设置 PointerType。
-    """
-    ppt = ensure_powerpoint_in_slideshow()
+def _set_pointer(status: str):
+    ppt = _cached_ensure_ppt()
     view = _get_slideshow_view(ppt)
     if view is None:
         return
     try:
-        c = win32com.client.constants
-        mapping = {
-            "arrow": 1,   # 常数 ppSlideShowPointerNone/Arrow 等（1通常是箭头）
-            "pen": 2,
-            "eraser": 3
-        }
-        view.PointerType = mapping.get(status, 1)
+        view.PointerType = _POINTER_MAP.get(status, _POINTER_MAP["arrow"])
     except Exception as e:
+        _invalidate_view_cache()
         print("切换指针状态失败:", e)
 
 
-def ClearAllInkInPPT():
+def _clear_ink():
     try:
-        ppt = ensure_powerpoint_in_slideshow()
+        ppt = _cached_ensure_ppt()
         view = _get_slideshow_view(ppt)
         if view:
             view.EraseAllInk()
     except Exception as e:
+        _invalidate_view_cache()
         print("清除墨迹失败:", e)
 
 
-def GetCurrentSlideIndex() -> int:
+def _current_slide_index() -> int:
     try:
-        ppt = ensure_powerpoint_in_slideshow()
+        ppt = _cached_ensure_ppt()
         view = _get_slideshow_view(ppt)
         if view and view.Slide is not None:
             return int(view.Slide.SlideIndex)
     except Exception:
-        pass
+        _invalidate_view_cache()
     return -1
 
 
+def _tracked_slide_index() -> int:
+    """返回本地跟踪的幻灯片索引，未知或超过同步间隔时从 COM 同步一次"""
+    global _local_slide_idx, _local_slide_synced_at
+    now = time.monotonic()
+    if _local_slide_idx is None or now - _local_slide_synced_at >= _SLIDE_INDEX_RESYNC_INTERVAL:
+        idx = _current_slide_index()
+        if idx < 1:
+            return idx
+        _local_slide_idx = idx
+        _local_slide_synced_at = now
+    return _local_slide_idx
+
+
+def _view_all_slides():
+    global _local_slide_idx
+    _send_keys("g")
+    # 用户可能在幻灯片浏览中跳转到任意一页
+    _local_slide_idx = None
+
+
+# 对外的控制接口：全部投递到 COM 工作线程执行
+def SendPageDownToPPT():
+    _ppt_post(_page_down)
+
+
+def SendPageUpToPPT():
+    _ppt_post(_page_up)
+
+
+def SendEscToPPT():
+    _ppt_post(_exit_slideshow)
+
+
+def SendKeysToPPT(keys: str):
+    _ppt_post(_send_keys, keys)
+
+
+def ToogleArrowStatusToPPT(status: str):
+    """
+    status: "arrow" / "pen" / "eraser"
+    使用 PowerPoint 常量设置 PointerType。
+    """
+    _ppt_post(_set_pointer, status)
+
+
+def ClearAllInkInPPT():
+    _ppt_post(_clear_ink)
+
+
+def SendViewAllSlidesToPPT():
+    _ppt_post(_view_all_slides)
+
+
+def GetCurrentSlideIndex() -> int:
+    return _ppt_wait(_ppt_call(_current_slide_index), -1)
+
+
+def GetTrackedSlideIndex() -> int:
+    """
+    与 GetCurrentSlideIndex 相同，但翻页后不再经 COM 读取，而是使用本地跟踪的索引。
+    本地索引限制在 1..幻灯片总数 之间，且最多每 _SLIDE_INDEX_RESYNC_INTERVAL 秒从 COM 重新同步一次；
+    在此之前，翻页只推进动画或在 PowerPoint 中直接翻页时本地索引可能不准。
+    """
+    return _ppt_wait(_ppt_call(_tracked_slide_index), -1)
+
+
 # ------- avtk 界面（按 AvTk 接口写法） -------
+# 翻页后刷新幻灯片索引标签的延迟（毫秒）
+_SLIDE_LABEL_REFRESH_MS = 30
+
+
 def create_interactive_window(title: str, width: int, height: int):
     """
     使用 avtk 提供的 AvTk / AvWindow 接口构建窗口并返回 (window, toolkit)
@@ -258,7 +697,11 @@ def makeLockedAvtkWindow():
     win = create_interactive_window("PPT已锁定", 400, 200)
     lbl = win.Label("检测到当前PPT处于只读或保护视图状态，请解除锁定后继续操作。").pack()
     def on_ok():
-        if not checkIfPPTLockedOrReadOnly():
+        locked = checkIfPPTLockedOrReadOnly()
+        if locked is None:
+            # PowerPoint 没有响应，状态未知：保持窗口，等用户再点一次
+            return
+        if not locked:
             # 关闭窗口（avtk 的 close 方法视具体实现而定）
             try:
                 win.destroy()
@@ -274,31 +717,80 @@ def makeLockedAvtkWindow():
     win.mainloop()
 
 
+def _nav(step, refresh):
+    """翻页按钮的回调：先翻页，再安排刷新索引标签"""
+    step()
+    refresh()
+
+
 def makeMainWindow():
     win = create_interactive_window("PPT控制面板", 400, 300)
     # 使用 avtk 的 Button/Label 接口
-    lbl_index = win.Label(f"当前幻灯片索引: {GetCurrentSlideIndex()}").pack()
+    lbl_index = win.Label("当前幻灯片索引: ").pack()
 
-    def update_slide_label():
+    def set_slide_label(idx):
         try:
-            lbl_index.set_text(f"当前幻灯片索引: {GetCurrentSlideIndex()}")
+            lbl_index.set_text(f"当前幻灯片索引: {idx}")
         except Exception:
             pass
 
-    win.Button("下一页", command=lambda: (SendPageDownToPPT(), update_slide_label())).pack()
-    win.Button("上一页", command=lambda: (SendPageUpToPPT(), update_slide_label())).pack()
-    win.Button("退出放映", command=SendEscToPPT).pack()
-    win.Button("查看所有幻灯片", command=lambda: SendKeysToPPT("g")).pack()
-    win.Button("切换到箭头", command=lambda: ToogleArrowStatusToPPT("arrow")).pack()
-    win.Button("切换到画笔", command=lambda: ToogleArrowStatusToPPT("pen")).pack()
-    win.Button("切换到橡皮擦", command=lambda: ToogleArrowStatusToPPT("eraser")).pack()
-    win.Button("清除所有墨迹", command=ClearAllInkInPPT).pack()
+    def update_slide_label():
+        after = getattr(win, "after", None)
+        if after is None:
+            set_slide_label(GetTrackedSlideIndex())
+            return
+        # 在工作线程上读取（排在已投递的翻页之后），界面线程只轮询结果，不阻塞等待
+        future = _ppt_call(_tracked_slide_index)
+
+        def poll():
+            if not future.done():
+                after(_SLIDE_LABEL_REFRESH_MS, poll)
+            elif future.exception() is None:
+                set_slide_label(future.result())
+
+        poll()
+
+    # 翻页后延迟刷新索引标签：翻页立即执行，连续按键期间的多次刷新合并为一次
+    refresh_pending = False
+
+    def run_scheduled_update():
+        nonlocal refresh_pending
+        refresh_pending = False
+        update_slide_label()
+
+    def schedule_slide_label_update():
+        nonlocal refresh_pending
+        after = getattr(win, "after", None)
+        if after is None:
+            # 窗口不支持定时回调时退回到同步刷新
+            update_slide_label()
+            return
+        if refresh_pending:
+            return
+        refresh_pending = True
+        after(_SLIDE_LABEL_REFRESH_MS, run_scheduled_update)
+
+    # 按钮规格集中在一处，统一创建
+    buttons = [
+        ("下一页", functools.partial(_nav, SendPageDownToPPT, schedule_slide_label_update)),
+        ("上一页", functools.partial(_nav, SendPageUpToPPT, schedule_slide_label_update)),
+        ("退出放映", SendEscToPPT),
+        ("查看所有幻灯片", SendViewAllSlidesToPPT),
+        ("切换到箭头", functools.partial(ToogleArrowStatusToPPT, "arrow")),
+        ("切换到画笔", functools.partial(ToogleArrowStatusToPPT, "pen")),
+        ("切换到橡皮擦", functools.partial(ToogleArrowStatusToPPT, "eraser")),
+        ("清除所有墨迹", ClearAllInkInPPT),
+    ]
+    for text, command in buttons:
+        win.Button(text, command=command).pack()
+    update_slide_label()
 
     win.mainloop()
 
 
 def runPPTControlPanel():
-    if checkIfPPTLockedOrReadOnly():
+    # 状态未知（None）时不当作已锁定，直接打开控制面板
+    if checkIfPPTLockedOrReadOnly() is True:
         makeLockedAvtkWindow()
     else:
         makeMainWindow()